@@ -32,6 +32,9 @@ SET_ADD = dis.opmap["SET_ADD"]
 UNARY_NOT = dis.opmap["UNARY_NOT"]
 
 
+_ATOMIC_IMMUTABLE_TYPESET = frozenset(ATOMIC_IMMUTABLE_TYPES)
+
+
 def frame_op_arg(frame):
     return frame.f_code.co_code[frame.f_lasti + 1]
 
@@ -43,7 +46,7 @@ class SymbolicSubscriptInterceptor(TracingModule):
         # Note that because this is called from inside a Python trace handler, tracing
         # is automatically disabled, so there's no need for a `with NoTracing():` guard.
         key = frame_stack_read(frame, -1)
-        if isinstance(key, (int, float, str)):
+        if type(key) in _ATOMIC_IMMUTABLE_TYPESET:
             return
         # If we got this far, the index is likely symbolic (or perhaps a slice object)
         container = frame_stack_read(frame, -2)
@@ -113,7 +116,7 @@ class BoolNegationStashingValue:
         return True
 
 
-_CONTAINMENT_OP_TYPES = tuple(
+_CONTAINMENT_OP_TYPES = frozenset(
     i for (i, name) in enumerate(dis.cmp_op) if name in ("in", "not in")
 )
 assert len(_CONTAINMENT_OP_TYPES) in (0, 2)
@@ -121,11 +124,10 @@ assert len(_CONTAINMENT_OP_TYPES) in (0, 2)
 
 class ContainmentInterceptor(TracingModule):
 
+    # Python 3.9+ has a dedicated CONTAINS_OP; only older versions use COMPARE_OP
+    # for containment. Don't pay for a trace callback on every comparison otherwise.
     opcodes_wanted = frozenset(
-        [
-            COMPARE_OP,
-            CONTAINS_OP,
-        ]
+        [COMPARE_OP, CONTAINS_OP] if _CONTAINMENT_OP_TYPES else [CONTAINS_OP]
     )
 
     def trace_op(self, frame, codeobj, codenum, extra):
@@ -224,7 +226,7 @@ class MapAddInterceptor(TracingModule):
         key = frame_stack_read(frame, key_offset)
         value = frame_stack_read(frame, value_offset)
         if isinstance(dict_obj, dict):
-            if type(key) in ATOMIC_IMMUTABLE_TYPES:
+            if type(key) in _ATOMIC_IMMUTABLE_TYPESET:
                 # Dict and key is (deeply) concrete; continue as normal.
                 return
             else:
@@ -1,6 +1,11 @@
+import enum
 from typing import List, Set
 
+import pytest
+
+import crosshair.opcode_intercept
 from crosshair.core_and_libs import NoTracing, proxy_for_type, standalone_statespace
+from crosshair.simplestructs import SimpleDict
 from crosshair.statespace import POST_FAIL, MessageType
 from crosshair.test_util import check_states
 from crosshair.z3util import z3And
@@ -19,6 +24,47 @@ def test_dict_index():
     check_states(numstr, POST_FAIL)
 
 
+@pytest.fixture
+def wrapped_dicts(monkeypatch) -> List[SimpleDict]:
+    wrapped: List[SimpleDict] = []
+
+    class TrackedSimpleDict(SimpleDict):
+        def __init__(self, contents):
+            wrapped.append(self)
+            super().__init__(contents)
+
+    monkeypatch.setattr(crosshair.opcode_intercept, "SimpleDict", TrackedSimpleDict)
+    return wrapped
+
+
+def _concrete_key_fn():
+    pass
+
+
+def test_dict_index_with_concrete_key(wrapped_dicts):
+    d = {None: 1, 2j: 2, _concrete_key_fn: 3}
+    with standalone_statespace:
+        assert d[None] == 1
+        assert d[2j] == 2
+        assert d[_concrete_key_fn] == 3
+    assert wrapped_dicts == []
+
+
+class _Color(enum.IntEnum):
+    RED = 1
+    BLUE = 2
+
+
+def test_dict_index_with_concrete_int_subclass_key(wrapped_dicts):
+    d = {i: str(i) for i in range(100)}
+    d[_Color.RED] = "red"
+    with standalone_statespace:
+        assert d[_Color.RED] == "red"
+        assert d[_Color.BLUE] == "2"
+    # Subclasses of the atomic types take the (slower, but correct) SimpleDict path:
+    assert len(wrapped_dicts) == 2
+
+
 def test_dict_key_containment():
     abc = {"two": 2, "four": 4, "six": 6}
 
@@ -31,6 +77,40 @@ def test_dict_key_containment():
     check_states(numstr, POST_FAIL)
 
 
+def test_dict_key_containment_with_symbolic_key():
+    d = {40: "forty", 42: "forty-two"}
+    with standalone_statespace as space:
+        with NoTracing():
+            x = proxy_for_type(int, "x")
+        found = x in d
+        # The lookup forks on the key comparisons; this path must agree with it:
+        with NoTracing():
+            assert space.is_possible(x.var == 41) != found
+            assert any(space.is_possible(x.var == k) for k in d) == found
+    assert d == {40: "forty", 42: "forty-two"}
+
+
+def test_dict_containment_when_key_eq_mutates_dict():
+    d = {}
+
+    class Meddler:
+        def __hash__(self):
+            return 0
+
+        def __eq__(self, other):
+            d.clear()
+            return False
+
+    d[Meddler()] = 1
+    d[Meddler()] = 2
+    with standalone_statespace as space:
+        with NoTracing():
+            x = proxy_for_type(int, "x")
+            space.add(x.var == 7)
+        assert (x in d) == False  # noqa: E712
+    assert d == {}
+
+
 def test_dict_comprehension():
     with standalone_statespace as space:
         with NoTracing():
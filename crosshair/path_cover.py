@@ -1,8 +1,20 @@
 import enum
+import heapq
 import traceback
 from dataclasses import dataclass
 from inspect import BoundArguments
-from typing import Callable, List, Optional, Set, TextIO, Tuple, Type
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Type,
+)
 
 from crosshair.condition_parser import condition_parser
 from crosshair.core import (
@@ -31,6 +43,7 @@ class CoverageType(enum.Enum):
 
 @dataclass
 class PathSummary:
+    __slots__ = ["args", "formatted_args", "result", "exc", "post_args", "coverage"]
     args: BoundArguments
     formatted_args: str
     result: str
@@ -39,6 +52,56 @@ class PathSummary:
     coverage: CoverageResult
 
 
+def _offsets_mask(offsets: Iterable[int]) -> int:
+    mask = 0
+    for offset in offsets:
+        mask |= 1 << offset
+    return mask
+
+
+def _select_paths(
+    paths: List[PathSummary], coverage_type: CoverageType
+) -> List[PathSummary]:
+    if coverage_type == CoverageType.OPCODE:
+        # Paths that cover the same opcodes are interchangeable here; keep just one
+        # of each (the one with the shortest arguments, for readable output).
+        by_coverage: Dict[FrozenSet[int], PathSummary] = {}
+        for path in paths:
+            cov = path.coverage.offsets_covered
+            incumbent = by_coverage.setdefault(cov, path)
+            if len(path.formatted_args) < len(incumbent.formatted_args):
+                by_coverage[cov] = path
+        paths = list(by_coverage.values())
+
+    # Opcode offsets are small integers, so we do the set cover math on bitmasks.
+    masks = [_offsets_mask(p.coverage.offsets_covered) for p in paths]
+    found_mask = 0
+    selected: List[PathSummary] = []
+    # Greedy set cover, done lazily: a path's gain can only shrink as more opcodes
+    # are found, so a stale heap entry whose gain is still accurate is the best pick.
+    # (the path index breaks ties in favor of the earliest path, like max() would)
+    heap = [(-len(p.coverage.offsets_covered), idx) for idx, p in enumerate(paths)]
+    heapq.heapify(heap)
+    while heap:
+        neg_gain, idx = heapq.heappop(heap)
+        mask = masks[idx]
+        gain = bin(mask & ~found_mask).count("1")
+        if gain != -neg_gain:
+            heapq.heappush(heap, (-gain, idx))
+            continue
+        next_best = paths[idx]
+        if coverage_type == CoverageType.OPCODE:
+            debug(
+                "Next best path covers these opcode offsets:",
+                next_best.coverage.offsets_covered,
+            )
+            if gain == 0:
+                break
+        selected.append(next_best)
+        found_mask |= mask
+    return selected
+
+
 def path_cover(
     ctxfn: FunctionInfo,
     options: AnalysisOptions,
@@ -56,9 +119,8 @@ def path_cover(
     coverage: CoverageTracingModule = CoverageTracingModule(fn)
 
     def run_path(args: BoundArguments):
-        nonlocal coverage
         with NoTracing():
-            coverage = CoverageTracingModule(fn)
+            coverage.reset()
         with PushedModule(coverage):
             return fn(*args.args, **args.kwargs)
 
@@ -76,9 +138,9 @@ def path_cover(
             reprer = context_statespace().extra(LazyCreationRepr)
             formatted_pre_args = reprer.eval_friendly_format(pre_args, arg_formatter)
 
-            pre_args = deep_realize(pre_args)
-            post_args = deep_realize(post_args)
-            ret = deep_realize(ret)
+            # Realize everything in one walk, so that objects shared between the
+            # arguments and the return value are only realized once:
+            pre_args, post_args, ret = deep_realize((pre_args, post_args, ret))
 
             cov = coverage.get_results(fn)
             if exc is not None:
@@ -100,36 +162,21 @@ def path_cover(
 
     explore_paths(run_path, sig, options, search_root, on_path_complete)
 
-    opcodes_found: Set[int] = set()
-    selected: List[PathSummary] = []
-    while paths:
-        next_best = max(
-            paths, key=lambda p: len(p.coverage.offsets_covered - opcodes_found)
-        )
-        cur_offsets = next_best.coverage.offsets_covered
-        if coverage_type == CoverageType.OPCODE:
-            debug("Next best path covers these opcode offsets:", cur_offsets)
-            if len(cur_offsets - opcodes_found) == 0:
-                break
-        selected.append(next_best)
-        opcodes_found |= cur_offsets
-        paths = [p for p in paths if p is not next_best]
-    return selected
+    return _select_paths(paths, coverage_type)
 
 
 def output_argument_dictionary_paths(
     fn: Callable, paths: List[PathSummary], stdout: TextIO, stderr: TextIO
 ):
-    for path in paths:
-        stdout.write(path.formatted_args + "\n")
+    stdout.write("".join(path.formatted_args + "\n" for path in paths))
     stdout.flush()
 
 
 def output_eval_exression_paths(
     fn: Callable, paths: List[PathSummary], stdout: TextIO, stderr: TextIO
 ):
-    for path in paths:
-        stdout.write(fn.__name__ + "(" + path.formatted_args + ")\n")
+    prefix = fn.__name__ + "("
+    stdout.write("".join(prefix + path.formatted_args + ")\n" for path in paths))
     stdout.flush()
 
 
@@ -139,13 +186,10 @@ def output_pytest_paths(
     fn_name = fn.__qualname__
     if fn_name.startswith(fn.__module__):  # use .removeprefix() after 3.7 deprecation
         fn_name = fn_name[len(fn.__module__) :]
-    imports: Set[str] = set()
+    # Methods are imported through their (outermost) class:
+    import_name = fn_name.split(".", 1)[0]
+    imports: Set[str] = {f"from {fn.__module__} import {import_name}"}
     lines: List[str] = []
-    if "." in fn_name:
-        class_name, _ = fn_name.split(".", 2)
-        imports.add(f"from {fn.__module__} import {class_name}")
-    else:
-        imports.add(f"from {fn.__module__} import {fn_name}")
     name_with_underscores = fn_name.replace(".", "_")
     for idx, path in enumerate(paths):
         test_name_suffix = "" if idx == 0 else "_" + str(idx + 1)
@@ -1,18 +1,20 @@
 import functools
 import re
 from io import StringIO
-from typing import Callable, Optional
+from typing import Callable, Iterable, Optional
 
 from crosshair.fnutil import FunctionInfo
 from crosshair.options import DEFAULT_OPTIONS
 from crosshair.path_cover import (
     CoverageType,
+    PathSummary,
+    _select_paths,
     output_eval_exression_paths,
     output_pytest_paths,
     path_cover,
 )
 from crosshair.statespace import context_statespace
-from crosshair.tracers import NoTracing
+from crosshair.tracers import CoverageResult, NoTracing
 
 
 def _foo(x: int) -> int:
@@ -37,6 +39,12 @@ def _has_no_successful_paths(x: int) -> None:
         context_statespace().defer_assumption("fail", lambda: False)
 
 
+class _Outer:
+    class Inner:
+        def method(self, x: int) -> int:
+            return x
+
+
 OPTS = DEFAULT_OPTIONS.overlay(max_iterations=10, per_condition_timeout=10.0)
 foo = FunctionInfo.from_fn(_foo)
 decorated_foo = FunctionInfo.from_fn(functools.lru_cache()(_foo))
@@ -74,6 +82,29 @@ def test_path_cover_exception_example() -> None:
     assert "_exceptionex(42)" in out.getvalue()
 
 
+def _fake_path(formatted_args: str, offsets: Iterable[int]) -> PathSummary:
+    offsets_covered = frozenset(offsets)
+    coverage = CoverageResult(offsets_covered, set(range(10)), 0.0)
+    return PathSummary(None, formatted_args, "", None, None, coverage)  # type: ignore
+
+
+def test_select_paths_keeps_shortest_of_identical_coverage() -> None:
+    longer = _fake_path("x=1000000", [0, 2, 4])
+    shorter = _fake_path("x=1", [0, 2, 4])
+    assert _select_paths([longer, shorter], CoverageType.OPCODE) == [shorter]
+    assert _select_paths([shorter, longer], CoverageType.OPCODE) == [shorter]
+
+
+def test_select_paths_breaks_ties_in_favor_of_the_earliest_path() -> None:
+    first = _fake_path("x=1", [0, 2])
+    second = _fake_path("x=2", [0, 4])
+    bigger = _fake_path("x=3", [0, 6, 8])
+    selected = _select_paths([first, second, bigger], CoverageType.OPCODE)
+    assert selected == [bigger, first, second]
+    selected = _select_paths([second, first, bigger], CoverageType.OPCODE)
+    assert selected == [bigger, second, first]
+
+
 def test_has_no_successful_paths() -> None:
     assert list(path_cover(has_no_successful_paths, OPTS, CoverageType.OPCODE)) == []
 
@@ -105,3 +136,15 @@ def test_path_cover_pytest_output() -> None:
         "        _exceptionex(42)",
         "",
     ]
+
+
+def test_path_cover_pytest_output_for_nested_class_method() -> None:
+    path = _fake_path("_Outer.Inner(), 2", [0])
+    path.result = 2  # type: ignore
+    imports, lines = output_pytest_paths(_Outer.Inner.method, [path])
+    assert imports == {"from crosshair.path_cover_test import _Outer"}
+    assert lines == [
+        "def test__Outer_Inner_method():",
+        "    assert _Outer.Inner.method(_Outer.Inner(), 2) == 2",
+        "",
+    ]
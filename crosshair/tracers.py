@@ -8,7 +8,17 @@ import traceback
 from collections import defaultdict
 from sys import _getframe
 from types import CodeType, FrameType
-from typing import Any, Callable, DefaultDict, Dict, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 import opcode
 
@@ -69,9 +79,13 @@ if sys.version_info >= (3, 11):
             frame = self.f_frame.contents
             return frame.localsplus[frame.stacktop + idx]
 
-        def stackwrite(self, idx: int, val: object):
+        def stackswap(self, idx: int, val: object) -> object:
             frame = self.f_frame.contents
-            frame.localsplus[frame.stacktop + idx] = val
+            localsplus = frame.localsplus
+            pos = frame.stacktop + idx
+            old_val = localsplus[pos]
+            localsplus[pos] = val
+            return old_val
 
 elif sys.version_info >= (3, 10):
 
@@ -93,8 +107,12 @@ elif sys.version_info >= (3, 10):
         def stackread(self, idx: int) -> object:
             return self.f_valuestack[(self.f_stackdepth) + idx]
 
-        def stackwrite(self, idx: int, val: object):
-            self.f_valuestack[(self.f_stackdepth) + idx] = val
+        def stackswap(self, idx: int, val: object) -> object:
+            valuestack = self.f_valuestack
+            pos = self.f_stackdepth + idx
+            old_val = valuestack[pos]
+            valuestack[pos] = val
+            return old_val
 
 else:  # Python < 3.10
 
@@ -115,8 +133,11 @@ else:  # Python < 3.10
         def stackread(self, idx: int) -> object:
             return self.f_stacktop[idx]
 
-        def stackwrite(self, idx: int, val: object) -> None:
-            self.f_stacktop[idx] = val
+        def stackswap(self, idx: int, val: object) -> object:
+            stacktop = self.f_stacktop
+            old_val = stacktop[idx]
+            stacktop[idx] = val
+            return old_val
 
 
 def frame_stack_read(frame, idx) -> Any:
@@ -127,13 +148,11 @@ def frame_stack_read(frame, idx) -> Any:
 
 
 def frame_stack_write(frame, idx, val):
-    c_frame = CFrame.from_address(id(frame))
-    old_val = c_frame.stackread(idx)
+    old_val = CFrame.from_address(id(frame)).stackswap(idx, val)
     try:
         Py_IncRef(ctypes.py_object(val))
     except ValueError:  # (PyObject is NULL) - no incref required
         pass
-    c_frame.stackwrite(idx, val)
     try:
         Py_DecRef(ctypes.py_object(old_val))
     except ValueError:  # (PyObject is NULL) - no decref required
@@ -383,7 +402,7 @@ class PatchingModule(TracingModule):
 
 @dataclasses.dataclass
 class CoverageResult:
-    offsets_covered: Set[int]
+    offsets_covered: FrozenSet[int]
     all_offsets: Set[int]
     opcode_coverage: float
 
@@ -409,6 +428,9 @@ class CoverageTracingModule(TracingModule):
         assert lasti in self.opcode_offsets[code]
         self.offsets_seen[code].add(lasti)
 
+    def reset(self) -> None:
+        self.offsets_seen.clear()
+
     def get_results(self, fn: Optional[Callable] = None):
         if fn is None:
             assert len(self.fns) == 1
@@ -416,7 +438,7 @@ class CoverageTracingModule(TracingModule):
         possible = self.opcode_offsets[fn.__code__]
         seen = self.offsets_seen[fn.__code__]
         return CoverageResult(
-            offsets_covered=seen,
+            offsets_covered=frozenset(seen),
             all_offsets=possible,
             opcode_coverage=len(seen) / len(possible),
         )
@@ -117,3 +117,9 @@ def test_measure_fn_coverage() -> None:
         # Note that we can't get 100% - there's an extra "return None"
         # at the end that's unreachable.
         assert cov3.get_results().opcode_coverage > 0.85
+
+        cov3.reset()
+        assert cov3.get_results().opcode_coverage == 0
+        with PushedModule(cov3):
+            calls_foo(5)
+        assert cov3.get_results() == cov1.get_results()